@@ -457,12 +457,11 @@ def _build_voxel_matrix(material_matrix, mask_solid, spacer_thick, structure_mod
         # Bottom layers
         full_matrix[0:5] = bottom_voxels
         
-        # Backing
+        # Backing (one broadcast assignment instead of a per-layer loop)
         spacer = np.full((target_h, target_w), -1, dtype=int)
         spacer[~mask_transparent] = 0
-        for z in range(5, 5 + spacer_layers):
-            full_matrix[z] = spacer
-        
+        full_matrix[5:5 + spacer_layers] = spacer
+
         # Top layers
         full_matrix[5 + spacer_layers:] = top_voxels
     else:
@@ -473,11 +472,10 @@ def _build_voxel_matrix(material_matrix, mask_solid, spacer_thick, structure_mod
         # Bottom layers
         full_matrix[0:5] = bottom_voxels
         
-        # Backing
+        # Backing (one broadcast assignment instead of a per-layer loop)
         spacer = np.full((target_h, target_w), -1, dtype=int)
         spacer[~mask_transparent] = 0
-        for z in range(5, total_layers):
-            full_matrix[z] = spacer
+        full_matrix[5:] = spacer
     
     return full_matrix
 
@@ -524,48 +522,43 @@ def _create_preview_mesh(matched_rgb, mask_solid, total_layers):
     else:
         shrink = 0.05
     
-    # Generate voxel mesh
-    vertices = []
-    faces = []
-    face_colors = []
-    
-    for y in range(height):
-        for x in range(width):
-            if not mask_solid[y, x]:
-                continue
-            
-            rgb = matched_rgb[y, x]
-            rgba = [int(rgb[0]), int(rgb[1]), int(rgb[2]), 255]
-            
-            world_y = (height - 1 - y)
-            x0, x1 = x + shrink, x + 1 - shrink
-            y0, y1 = world_y + shrink, world_y + 1 - shrink
-            z0, z1 = 0, total_layers
-            
-            base_idx = len(vertices)
-            vertices.extend([
-                [x0, y0, z0], [x1, y0, z0], [x1, y1, z0], [x0, y1, z0],
-                [x0, y0, z1], [x1, y0, z1], [x1, y1, z1], [x0, y1, z1]
-            ])
-            
-            cube_faces = [
-                [0, 2, 1], [0, 3, 2],  # bottom
-                [4, 5, 6], [4, 6, 7],  # top
-                [0, 1, 5], [0, 5, 4],  # front
-                [1, 2, 6], [1, 6, 5],  # right
-                [2, 3, 7], [2, 7, 6],  # back
-                [3, 0, 4], [3, 4, 7]   # left
-            ]
-            
-            for f in cube_faces:
-                faces.append([v + base_idx for v in f])
-                face_colors.append(rgba)
-    
-    if not vertices:
+    # Generate voxel mesh (vectorized: emit all cubes in bulk instead of
+    # looping over pixels in Python)
+    ys, xs = np.nonzero(mask_solid)
+    num_cubes = len(xs)
+    if num_cubes == 0:
         return None
-    
+
+    world_y = height - 1 - ys
+    x0, x1 = xs + shrink, xs + 1 - shrink
+    y0, y1 = world_y + shrink, world_y + 1 - shrink
+
+    # 8 corners per cube, same ordering as the old per-pixel loop
+    corners_x = np.stack([x0, x1, x1, x0, x0, x1, x1, x0], axis=1)
+    corners_y = np.stack([y0, y0, y1, y1, y0, y0, y1, y1], axis=1)
+    corners_z = np.broadcast_to(
+        np.array([0.0] * 4 + [float(total_layers)] * 4), (num_cubes, 8)
+    )
+    vertices = np.stack([corners_x, corners_y, corners_z], axis=2).reshape(-1, 3)
+
+    cube_faces = np.array([
+        [0, 2, 1], [0, 3, 2],  # bottom
+        [4, 5, 6], [4, 6, 7],  # top
+        [0, 1, 5], [0, 5, 4],  # front
+        [1, 2, 6], [1, 6, 5],  # right
+        [2, 3, 7], [2, 7, 6],  # back
+        [3, 0, 4], [3, 4, 7]   # left
+    ])
+    offsets = (np.arange(num_cubes) * 8)[:, None, None]
+    faces = (cube_faces[None, :, :] + offsets).reshape(-1, 3)
+
+    rgba = np.empty((num_cubes, 4), dtype=np.uint8)
+    rgba[:, :3] = matched_rgb[ys, xs]
+    rgba[:, 3] = 255
+    face_colors = np.repeat(rgba, 12, axis=0)
+
     mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
-    mesh.visual.face_colors = np.array(face_colors, dtype=np.uint8)
+    mesh.visual.face_colors = face_colors
     
     print(f"[PREVIEW] Generated: {len(mesh.vertices):,} vertices, {len(mesh.faces):,} faces")
     
@@ -19,6 +19,24 @@ from config import (
 from utils import Stats
 
 
+# Corner marker colors per color system (BGR for OpenCV), keyed by mode name
+# so draw_corner_points does a single lookup instead of rebuilding the list
+_CORNER_DRAW_COLORS = {
+    'CMYW': [
+        (255, 255, 255),  # White
+        (214, 134, 0),    # Cyan (BGR)
+        (140, 0, 236),    # Magenta (BGR)
+        (42, 238, 244)    # Yellow (BGR)
+    ],
+    'RYBW': [
+        (255, 255, 255),  # White
+        (60, 20, 220),    # Red (BGR)
+        (240, 100, 0),    # Blue (BGR)
+        (0, 230, 255)     # Yellow (BGR)
+    ]
+}
+
+
 def generate_simulated_reference():
     """Generate reference image for visual comparison."""
     colors = {
@@ -62,21 +80,7 @@ def draw_corner_points(img, points, color_mode: str):
     color_conf = ColorSystem.get(color_mode)
     labels = color_conf['corner_labels']
 
-    # Define colors for drawing (BGR for OpenCV)
-    if "CMYW" in color_mode:
-        draw_colors = [
-            (255, 255, 255),  # White
-            (214, 134, 0),    # Cyan (BGR)
-            (140, 0, 236),    # Magenta (BGR)
-            (42, 238, 244)    # Yellow (BGR)
-        ]
-    else:  # RYBW
-        draw_colors = [
-            (255, 255, 255),  # White
-            (60, 20, 220),    # Red (BGR)
-            (240, 100, 0),    # Blue (BGR)
-            (0, 230, 255)     # Yellow (BGR)
-        ]
+    draw_colors = _CORNER_DRAW_COLORS['CMYW' if "CMYW" in color_mode else 'RYBW']
 
     for i, pt in enumerate(points):
         color = draw_colors[i] if i < 4 else (0, 255, 0)
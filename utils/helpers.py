@@ -3,10 +3,105 @@ Lumina Studio - Helper Functions
 Helper functions module
 """
 
+import logging
+import os
+import shutil
 import zipfile
-import re
 from typing import List
 
+# Prefer lxml's C-accelerated parser for the multi-MB model XML inside 3MF
+# archives; fall back to the stdlib parser when lxml is not installed
+try:
+    from lxml import etree as ET
+    _USING_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _USING_LXML = False
+
+# 3MF core specification namespace (used by all <model> payloads)
+MODEL_NAMESPACE = "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"
+
+# Register the default namespace once per process so stdlib serialization
+# stays unprefixed; lxml preserves the original nsmap itself and rejects an
+# empty prefix
+if not _USING_LXML:
+    ET.register_namespace('', MODEL_NAMESPACE)
+
+logger = logging.getLogger(__name__)
+
+# Clark-notation tags, precomputed once so hot loops compare interned strings
+# instead of splitting each element's namespace off per visit
+OBJECT_TAG = f'{{{MODEL_NAMESPACE}}}object'
+RESOURCES_TAG = f'{{{MODEL_NAMESPACE}}}resources'
+BUILD_TAG = f'{{{MODEL_NAMESPACE}}}build'
+ITEM_TAG = f'{{{MODEL_NAMESPACE}}}item'
+COMPONENTS_TAG = f'{{{MODEL_NAMESPACE}}}components'
+COMPONENT_TAG = f'{{{MODEL_NAMESPACE}}}component'
+
+
+def _process_model_tree(root, slot_names: List[str], create_assembly: bool):
+    """
+    Assign slot names to the model's objects and optionally collapse them
+    into a single assembly. Mutates an already-parsed <model> root in place
+    so the payload is parsed and serialized exactly once by the caller.
+
+    Returns:
+        True if the tree was modified (caller can skip re-serializing and
+        rewriting the archive otherwise)
+    """
+    resources = root.find(RESOURCES_TAG)
+    if resources is None:
+        return False
+
+    # Single walk over the resources: collect ids, track the max id, detect
+    # an existing assembly (objects made of <components> keep their own name
+    # and must not be wrapped again), and assign slot names as we go
+    modified = False
+    has_assembly = False
+    object_ids = []
+    max_id = 0
+    names = iter(slot_names)
+
+    for obj in resources.findall(OBJECT_TAG):
+        oid = obj.get('id')
+        if not oid:
+            continue
+        max_id = max(max_id, int(oid))
+        if obj.find(COMPONENTS_TAG) is not None:
+            has_assembly = True
+            continue
+        object_ids.append(oid)
+        name = next(names, None)
+        if name is not None and obj.get('name') != name:
+            obj.set('name', name)
+            modified = True
+
+    logger.debug("Found %d objects in 3MF: %s", len(object_ids), object_ids)
+
+    # Create assembly if requested and the file does not already have one
+    if create_assembly and not has_assembly and len(object_ids) > 1:
+        assembly_id = str(max_id + 1)
+
+        assembly = ET.SubElement(
+            resources, OBJECT_TAG,
+            {'id': assembly_id, 'type': 'model', 'name': 'Lumina_Model'}
+        )
+        components = ET.SubElement(assembly, COMPONENTS_TAG)
+        for oid in object_ids:
+            ET.SubElement(components, COMPONENT_TAG, {'objectid': oid})
+        modified = True
+        logger.debug("Created assembly with id=%s, containing %d components", assembly_id, len(object_ids))
+
+        # Modify <build> section to only reference the assembly
+        build = root.find(BUILD_TAG)
+        if build is not None:
+            for item in list(build):
+                build.remove(item)
+            ET.SubElement(build, ITEM_TAG, {'objectid': assembly_id})
+            logger.debug("Updated build section to reference assembly")
+
+    return modified
+
 
 def safe_fix_3mf_names(filepath: str, slot_names: List[str], create_assembly: bool = True):
     """
@@ -18,93 +113,63 @@ def safe_fix_3mf_names(filepath: str, slot_names: List[str], create_assembly: bo
         slot_names: Object name list
         create_assembly: Whether to create assembly
     """
+    if not slot_names and not create_assembly:
+        # Nothing to rename and no assembly wanted; skip the parse entirely
+        return
+
+    tmp_path = filepath + '.tmp'
     try:
-        # Read original 3MF
         with zipfile.ZipFile(filepath, 'r') as zf_in:
-            files_data = {}
-            for name in zf_in.namelist():
-                files_data[name] = zf_in.read(name)
-
-        # Find the 3D model file
-        model_file = None
-        for name in files_data:
-            if name.endswith('.model') and '3D/' in name:
-                model_file = name
-                break
-
-        if model_file and model_file in files_data:
-            content = files_data[model_file].decode('utf-8')
-
-            # Find all <object> tags with their IDs (in order of appearance)
-            object_pattern = re.compile(r'<object\s+([^>]*)>', re.IGNORECASE)
-
-            # Track which objects we've seen
-            obj_info = []  # List of (start_pos, end_pos, full_tag, id)
-
-            for match in object_pattern.finditer(content):
-                attrs = match.group(1)
-                id_match = re.search(r'\bid="(\d+)"', attrs)
-                if id_match:
-                    obj_id = id_match.group(1)
-                    obj_info.append((match.start(), match.end(), match.group(0), obj_id))
-
-            # Collect object IDs for assembly
-            object_ids = [info[3] for info in obj_info]
-            print(f"[DEBUG] Found {len(object_ids)} objects in 3MF: {object_ids}")
-
-            # Process in reverse order to preserve positions (for name fixing)
-            for idx, (start, end, old_tag, obj_id) in enumerate(reversed(obj_info)):
-                real_idx = len(obj_info) - 1 - idx
-                if real_idx >= len(slot_names):
-                    continue
-
-                color_name = slot_names[real_idx]
-
-                # Remove existing name attribute and add new one
-                new_tag = re.sub(r'\s+name="[^"]*"', '', old_tag)
-                new_tag = new_tag[:-1] + f' name="{color_name}">'
-
-                content = content[:start] + new_tag + content[end:]
-
-            # Create assembly if requested
-            if create_assembly and len(object_ids) > 1:
-                # Find the maximum object ID
-                max_id = max(int(oid) for oid in object_ids)
-                assembly_id = max_id + 1
-
-                # Create assembly object XML
-                components_xml = '\n'.join([f'      <component objectid="{oid}" />' for oid in object_ids])
-                assembly_xml = f'''
-  <object id="{assembly_id}" type="model" name="Lumina_Model">
-    <components>
-{components_xml}
-    </components>
-  </object>
-'''
-
-                # Insert assembly before </resources>
-                resources_end = content.find('</resources>')
-                if resources_end != -1:
-                    content = content[:resources_end] + assembly_xml + content[resources_end:]
-                    print(f"[DEBUG] Created assembly with id={assembly_id}, containing {len(object_ids)} components")
-
-                # Modify <build> section to only reference the assembly
-                # Find and replace the build section
-                build_pattern = re.compile(r'<build>.*?</build>', re.DOTALL)
-                build_match = build_pattern.search(content)
-                if build_match:
-                    new_build = f'<build>\n    <item objectid="{assembly_id}" />\n  </build>'
-                    content = content[:build_match.start()] + new_build + content[build_match.end():]
-                    print(f"[DEBUG] Updated build section to reference assembly")
-
-            files_data[model_file] = content.encode('utf-8')
-
-        # Write back
-        with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED) as zf_out:
-            for name, data in files_data.items():
-                zf_out.writestr(name, data)
-
-        print(f"[DEBUG] 3MF file updated successfully: {filepath}")
+            entries = zf_in.infolist()
+
+            # Find the 3D model file
+            model_file = None
+            for info in entries:
+                if info.filename.endswith('.model') and '3D/' in info.filename:
+                    model_file = info.filename
+                    break
+
+            model_data = None
+            if model_file:
+                # Parse once, mutate the tree, serialize once
+                root = ET.fromstring(zf_in.read(model_file))
+                if _process_model_tree(root, slot_names, create_assembly):
+                    model_data = ET.tostring(root, xml_declaration=True, encoding='utf-8')
+
+            if model_data is None:
+                # Nothing changed; leave the archive untouched rather than
+                # re-serializing and rewriting every entry
+                logger.debug("No changes needed for 3MF: %s", filepath)
+                return
+
+            # Stream entries to a temporary archive instead of buffering the
+            # whole 3MF in memory; only the model file gets new bytes.
+            # Passing the original ZipInfo keeps stored entries stored (e.g.
+            # already-compressed textures) and preserves entry metadata
+            with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED,
+                                 allowZip64=True) as zf_out:
+                for info in entries:
+                    if info.filename == model_file:
+                        # The model XML compresses ~10x, so it stays on the
+                        # default deflate level; dropping it to level 1
+                        # would inflate the archive by a third
+                        zf_out.writestr(info, model_data)
+                    else:
+                        if info.compress_type == zipfile.ZIP_DEFLATED:
+                            # Level 1 deflate for pass-through entries we
+                            # are only recompressing, not authoring. The
+                            # level must go on the ZipInfo itself: entries
+                            # read from an archive carry none, and writes
+                            # handed a ZipInfo ignore the archive default
+                            info._compresslevel = 1
+                        with zf_in.open(info.filename) as src, \
+                                zf_out.open(info, 'w', force_zip64=True) as dst:
+                            shutil.copyfileobj(src, dst, 1024 * 1024)
+
+        os.replace(tmp_path, filepath)
+        logger.debug("3MF file updated successfully: %s", filepath)
 
     except Exception as e:
-        print(f"Warning: Could not fix 3MF names: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        logger.warning("Could not fix 3MF names: %s", e)
@@ -14,6 +14,10 @@ class LUTManager:
     
     # LUT preset folder path
     LUT_PRESET_DIR = "lut-npy预设"
+
+    # Extra characters allowed in sanitized preset names (frozenset gives
+    # O(1) membership instead of scanning a tuple per character)
+    _SAFE_NAME_CHARS = frozenset(" -_中文")
     
     @classmethod
     def get_all_lut_files(cls):
@@ -111,7 +115,7 @@ class LUTManager:
                 final_name = original_name
             
             # Ensure filename is safe
-            final_name = "".join(c for c in final_name if c.isalnum() or c in (' ', '-', '_', '中', '文'))
+            final_name = "".join(c for c in final_name if c.isalnum() or c in cls._SAFE_NAME_CHARS)
             final_name = final_name.strip()
             
             if not final_name: